@@ -4,12 +4,15 @@ from get_version import get_version as get_current_version
 from util import error
 import datetime
 import os
+import pathlib
+import re
 import subprocess
 import sys
 
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 REPO_DIR = os.path.realpath(os.path.join(SCRIPT_DIR, ".."))
+MANIFEST_VERSION_PATTERN = re.compile(r'^(version\s*=\s*")([^"]+)(")', re.MULTILINE)
 
 
 def run(*cmd):
@@ -20,82 +23,81 @@ def run(*cmd):
 def get_next_version(bump_comp_idx, current_version):
     components = current_version.split(".")
 
-    all_digits = lambda c: all(map(str.isdigit, c))
-    is_empty = lambda c: len(c) == 0
-    is_int = lambda c: not is_empty(c) and all_digits(c)
+    if len(components) != 3 or not all(c.isdigit() for c in components):
+        error(f'"{current_version}" version number invalid')
 
-    has_three_components = len(components) == 3
-    all_components_are_ints = all(map(is_int, components))
+    next_components = [int(c) for c in components]
+    next_components[bump_comp_idx] += 1
+    for i in range(bump_comp_idx + 1, 3):
+        next_components[i] = 0
 
-    if not (has_three_components and all_components_are_ints):
-        error(f'"{version}" version number invalid')
-
-    components[bump_comp_idx] = int(components[bump_comp_idx]) + 1
-    [major, minor, patch] = [*components[:bump_comp_idx+1], 0, 0, 0][:3]
-
-    return f"{major}.{minor}.{patch}"
+    return ".".join(map(str, next_components))
 
 
 def update_version_file(next_version, path):
-    version_path = os.path.join(REPO_DIR, path)
-    with open(version_path, "w") as f:
-        f.write(next_version)
+    version_path = pathlib.Path(REPO_DIR, path)
+    version_path.write_text(next_version)
 
     return next_version
 
 
-def update_manifest(next_version, path, current_version):
-    manifest_path = os.path.join(REPO_DIR, path)
-    with open(manifest_path, "r") as f:
-        content = f.read()
+def update_manifest(next_version, path):
+    manifest_path = pathlib.Path(REPO_DIR, path)
+    content = manifest_path.read_text()
 
-    content = content.replace(f'version = "{current_version}"', f'version = "{next_version}"', 1)
+    content, count = MANIFEST_VERSION_PATTERN.subn(rf"\g<1>{next_version}\g<3>", content, count=1)
 
-    with open(manifest_path, "w") as f:
-        f.write(content)
+    if count == 0:
+        error("no package version found in manifest")
+
+    manifest_path.write_text(content)
 
 
 def update_changelog(next_version, path, repository_owner):
     HEADER_KEY = "## [Unreleased]"
 
-    changelog_path = os.path.join(REPO_DIR, path)
-    last_version, _ = run("git", "-C", REPO_DIR, "rev-list", "--date-order", "--tags", "--max-count=1")
+    changelog_path = pathlib.Path(REPO_DIR, path)
+    last_version, _ = run("git", "-C", REPO_DIR, "describe", "--tags", "--abbrev=0")
 
     if len(last_version) > 0:
-        stdout, stderr = run("git", "-C", REPO_DIR, "diff", last_version, "HEAD", "--", path)
-
-        if len(stderr) > 0:
-            error(stderr.strip())
-        if len(stdout) == 0:
+        output = subprocess.run(
+            ["git", "-C", REPO_DIR, "diff", "--quiet", f"{last_version}..HEAD", "--", path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+
+        if output.returncode == 0:
             error("no changes have been made to the changelog")
+        if output.returncode != 1:
+            error(output.stderr.strip())
 
-    with open(changelog_path, "r") as f:
-        content = f.read()
+    content = changelog_path.read_text()
 
     current_date = datetime.datetime.now(datetime.timezone.utc)
     formatted_date = current_date.strftime("%Y-%m-%d")
     new_header = f"## [{next_version}] - {formatted_date}"
-    new_content = content.replace(HEADER_KEY, new_header, 1)
+    header_pattern = re.compile(re.escape(HEADER_KEY))
 
-    if content == new_content:
-        error("no unreleased version section found")
-    if new_content != new_content.replace(HEADER_KEY, new_header):
+    if len(header_pattern.findall(content)) > 1:
         error("multiple unreleased version sections found")
 
-    new_content = new_content.replace(new_header, f"{HEADER_KEY}\n\n{new_header}\n\nImage tag: ghcr.io/{repository_owner}/game-box-backend:{next_version}")
-    with open(changelog_path, "w") as f:
-        f.write(new_content)
+    replacement = f"{HEADER_KEY}\n\n{new_header}\n\nImage tag: ghcr.io/{repository_owner}/game-box-backend:{next_version}"
+    new_content, count = header_pattern.subn(lambda _: replacement, content, count=1)
+
+    if count == 0:
+        error("no unreleased version section found")
+
+    changelog_path.write_text(new_content)
 
 
 def update_helm_chart(next_version, path, current_version):
-    helm_chart_path = os.path.join(REPO_DIR, path)
-    with open(helm_chart_path, "r") as f:
-        content = f.read()
+    helm_chart_path = pathlib.Path(REPO_DIR, path)
+    content = helm_chart_path.read_text()
 
     content = content.replace(f"version: {current_version}", f"version: {next_version}", 1)
 
-    with open(helm_chart_path, "w") as f:
-        f.write(content)
+    helm_chart_path.write_text(content)
 
     return next_version
 
@@ -105,7 +107,7 @@ def bump_version(bump_comp_idx, repository_owner):
     next_version = get_next_version(bump_comp_idx, current_version)
 
     update_version_file(next_version, "VERSION")
-    update_manifest(next_version, "Cargo.toml", current_version)
+    update_manifest(next_version, "Cargo.toml")
     update_changelog(next_version, "CHANGELOG.md", repository_owner)
     update_helm_chart(next_version, "config/helm/Chart.tmpl.yaml", current_version)
 
@@ -18,15 +18,19 @@ def get_changelog_body():
 
     version = get_version()
     version_line = f"## [{version}]"
-    version_split= content.split(version_line)
+    section_start = content.find(version_line)
 
-    if len(version_split) < 2:
-        error("version changelog section found")
-    if len(version_split) > 2:
+    if section_start < 0:
+        error("no version changelog section found")
+    if content.find(version_line, section_start + 1) >= 0:
         error("multiple version changelog sections found")
 
-    title_suffix_with_body_split = version_split[1].split("## [", 1)
-    body_split = title_suffix_with_body_split[0].split("\n", 1)
+    title_suffix_start = section_start + len(version_line)
+    section_end = content.find("## [", title_suffix_start)
+    if section_end < 0:
+        section_end = None
+
+    body_split = content[title_suffix_start:section_end].split("\n", 1)
 
     if len(body_split) == 1:
         error("invalid changelog format")
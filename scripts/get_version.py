@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import functools
 import os
 
 
@@ -7,12 +8,18 @@ SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 REPO_DIR = os.path.realpath(os.path.join(SCRIPT_DIR, ".."))
 
 
-def get_version():
+@functools.lru_cache(maxsize=1)
+def _read_version_file():
     VERSION_NAME = "VERSION"
 
     version_path = os.path.join(REPO_DIR, VERSION_NAME)
     with open(version_path, "r") as f:
-        content = f.read()
+        return f.read()
+
+
+def get_version(content=None):
+    if content is None:
+        content = _read_version_file()
 
     return content.strip()
 